@@ -14,9 +14,11 @@
 # limitations under the License.
 
 
-import glob
+import functools
 import os
+from concurrent.futures import ProcessPoolExecutor, wait
 import pandas as pd
+import pyarrow.csv as pacsv
 import seaborn as sns
 import matplotlib.pyplot as plt
 from pathlib import Path
@@ -34,6 +36,8 @@ COLORS = {
     "DVL": "#FFC107",
 }
 
+LINE_COLOR = "#404040"
+
 NAME_MAPPING = {
     "global": "FGO",
     "global_tm": "TM",
@@ -50,38 +54,106 @@ METRICS_CONFIG = [
     ("benchmark_rpe_rot.csv", "RPE Rotation RMSE (deg/m)", "rpe_rot"),
 ]
 
+SETTINGS.plot_backend = "Agg"
 SETTINGS.plot_figsize = [3.5, 3.0]
 SETTINGS.plot_fontfamily = "serif"
 SETTINGS.plot_seaborn_style = "whitegrid"
-SETTINGS.plot_usetex = True
+SETTINGS.plot_usetex = os.environ.get("COUG_USETEX") == "1"
 
 apply_settings(SETTINGS)
 sns.set_context("paper")
+plt.rcParams["savefig.bbox"] = "standard"
+plt.rcParams["mathtext.fontset"] = "cm"
 
 
 def load_data(bags_dir):
     data_store = {cfg[0]: [] for cfg in METRICS_CONFIG}
-    files = glob.glob(os.path.join(bags_dir, "**", "benchmark_*.csv"), recursive=True)
+    files = [
+        Path(root) / name
+        for root, _, names in os.walk(bags_dir, followlinks=True)
+        for name in names
+        if name.startswith("benchmark_") and name.endswith(".csv")
+    ]
 
     print(f"Found {len(files)} metric files.")
 
     for f in files:
-        filename = os.path.basename(f)
+        filename = f.name
         if filename not in data_store:
             continue
 
         try:
-            df = pd.read_csv(f, index_col=0)
-            for algo_key, row in df.iterrows():
-                label = NAME_MAPPING.get(algo_key, algo_key)
-                if label in ALGORITHMS:
-                    data_store[filename].append(
-                        {"Algorithm": label, "RMSE": row["rmse"]}
+            tbl = pacsv.read_csv(f, read_options=pacsv.ReadOptions(block_size=1 << 20))
+            keys = tbl.column(0).to_pandas()
+            rmses = tbl.column("rmse").to_numpy()
+            labels = keys.map(NAME_MAPPING).fillna(keys)
+            mask = labels.isin(ALGORITHMS).to_numpy()
+            if mask.any():
+                data_store[filename].append(
+                    pd.DataFrame(
+                        {"Algorithm": labels.to_numpy()[mask], "RMSE": rmses[mask]}
                     )
+                )
         except Exception as e:
             print(f"Error reading {f}: {e}")
 
-    return {k: pd.DataFrame(v) for k, v in data_store.items() if v}
+    return {k: pd.concat(v, ignore_index=True) for k, v in data_store.items() if v}
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_axes():
+    return plt.subplots(figsize=SETTINGS.plot_figsize)
+
+
+def _render_one(df, order, label, suffix, plot_type, output_dir):
+    fig, ax = _shared_axes()
+    ax.clear()
+
+    groups = [df.loc[df["Algorithm"] == algo, "RMSE"].to_numpy() for algo in order]
+    positions = range(len(order))
+
+    if plot_type == "violin":
+        parts = ax.violinplot(
+            groups, positions=positions, widths=0.8, showextrema=False
+        )
+        for body, algo in zip(parts["bodies"], order):
+            body.set_facecolor(COLORS[algo])
+            body.set_edgecolor(LINE_COLOR)
+            body.set_alpha(1.0)
+
+        # Thin inner box, as in seaborn's inner="box"
+        ax.boxplot(
+            groups,
+            positions=positions,
+            widths=0.05,
+            patch_artist=True,
+            showcaps=False,
+            showfliers=False,
+            boxprops={"facecolor": LINE_COLOR, "color": LINE_COLOR},
+            whiskerprops={"color": LINE_COLOR},
+            medianprops={"color": "white"},
+        )
+    else:
+        parts = ax.boxplot(groups, positions=positions, widths=0.8, patch_artist=True)
+        for box, algo in zip(parts["boxes"], order):
+            box.set_facecolor(COLORS[algo])
+            box.set_edgecolor(LINE_COLOR)
+        for key in ["whiskers", "caps", "medians"]:
+            for line in parts[key]:
+                line.set_color(LINE_COLOR)
+        for flier in parts["fliers"]:
+            flier.set_markeredgecolor(LINE_COLOR)
+
+    ax.set_xticks(positions, order)
+    ax.set_xlim(-0.5, len(order) - 0.5)
+    ax.xaxis.grid(False)
+    ax.set_title("")
+    ax.set_ylabel(label)
+    ax.set_xlabel("")
+
+    save_path = output_dir / f"{plot_type}_{suffix}.png"
+    fig.savefig(save_path, dpi=150, pil_kwargs={"compress_level": 1})
+    print(f"Saved {save_path}")
 
 
 def generate_plots(data_map, output_dir):
@@ -89,6 +161,7 @@ def generate_plots(data_map, output_dir):
         print("No data found to plot.")
         return
 
+    jobs = []
     for filename, label, suffix in METRICS_CONFIG:
         if filename not in data_map:
             print(f"No data for {filename}, skipping.")
@@ -109,39 +182,15 @@ def generate_plots(data_map, output_dir):
             print(f"No valid algorithms found in data for {filename}, skipping.")
             continue
 
-        df["Algorithm"] = pd.Categorical(
-            df["Algorithm"], categories=present_algos, ordered=True
-        )
-        df = df.sort_values("Algorithm")
-
         for plot_type in ["violin", "box"]:
-            plt.figure(figsize=SETTINGS.plot_figsize)
-            if plot_type == "violin":
-                sns.violinplot(
-                    x="Algorithm",
-                    y="RMSE",
-                    hue="Algorithm",
-                    data=df,
-                    inner="box",
-                    palette=COLORS,
-                )
-            else:
-                sns.boxplot(
-                    x="Algorithm",
-                    y="RMSE",
-                    hue="Algorithm",
-                    data=df,
-                    palette=COLORS,
-                )
+            jobs.append((df, present_algos, label, suffix, plot_type, output_dir))
 
-            plt.title("")
-            plt.ylabel(label)
-            plt.xlabel("")
+    with ProcessPoolExecutor() as executor:
+        futures = [executor.submit(_render_one, *job) for job in jobs]
+        wait(futures)
 
-            save_path = output_dir / f"{plot_type}_{suffix}.png"
-            plt.savefig(save_path, dpi=300, bbox_inches="tight")
-            print(f"Saved {save_path}")
-            plt.close()
+    for future in futures:
+        future.result()
 
 
 def main():
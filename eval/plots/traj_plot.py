@@ -14,9 +14,11 @@
 # limitations under the License.
 
 
-import glob
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import numpy as np
 from evo.tools import file_interface
 from evo.tools import plot
 from evo.tools.settings import SETTINGS
@@ -44,152 +46,154 @@ NAME_MAPPING = {
     "dvl": "DVL",
 }
 
+# Longest keys first so e.g. "iekf" wins over its "ekf" suffix
+NAME_PATTERN = re.compile(
+    "|".join(sorted(map(re.escape, NAME_MAPPING), key=len, reverse=True))
+)
+
+MAX_PLOT_POINTS = 2000
+
+# Set COUG_DISABLE_CACHE=1 to always reparse the evo result zips
+USE_CACHE = os.environ.get("COUG_DISABLE_CACHE") != "1"
+
+SETTINGS.plot_backend = "Agg"
 SETTINGS.plot_figsize = [3.5, 3.0]
 SETTINGS.plot_fontfamily = "serif"
 SETTINGS.plot_seaborn_style = "whitegrid"
-SETTINGS.plot_usetex = True
+SETTINGS.plot_usetex = os.environ.get("COUG_USETEX") == "1"
 
 plot.apply_settings(SETTINGS)
 sns.set_context("paper")
+plt.rcParams["savefig.bbox"] = "standard"
+plt.rcParams["mathtext.fontset"] = "cm"
 
 
-def add_start_end_markers(
-    ax,
-    traj,
-    start_symbol="o",
-    start_color="black",
-    end_symbol="x",
-    end_color="black",
-    alpha=1.0,
-):
-    if traj.num_poses == 0:
-        return
-    start = traj.positions_xyz[0]
-    end = traj.positions_xyz[-1]
-
-    # Assume XY mode
-    x_idx, y_idx = 0, 1
-
-    start_coords = [start[x_idx], start[y_idx]]
-    end_coords = [end[x_idx], end[y_idx]]
-
-    ax.scatter(
-        *start_coords,
-        marker=start_symbol,
-        color=start_color,
-        alpha=alpha,
-        zorder=10,
-    )
-    ax.scatter(
-        *end_coords,
-        marker=end_symbol,
-        color=end_color,
-        alpha=alpha,
-        zorder=10,
-    )
+def _plot_xy(ax, xyz, style, color, label):
+    # Strided decimation, keeping the final pose so the line meets its end marker
+    step = max(1, len(xyz) // MAX_PLOT_POINTS)
+    xy = np.vstack((xyz[::step, :2], xyz[-1:, :2]))
+    ax.plot(xy[:, 0], xy[:, 1], style, color=color, label=label)
 
 
-def load_trajectories(evo_agent_dir):
-    est_trajs = {}
-    gt_traj = None
+def _load_positions(z):
+    # Positions only, cached next to the zip until it is rewritten
+    cache = z.with_suffix(".npzcache")
+    if USE_CACHE:
+        try:
+            if cache.stat().st_mtime >= z.stat().st_mtime:
+                with np.load(cache) as data:
+                    return data["gt"], data["est"]
+        except Exception:
+            pass  # Missing or unreadable cache, fall back to the zip
+
+    res = file_interface.load_res_file(z, load_trajectories=True)
+
+    ref_id = Path(res.info["ref_name"]).name
+    est_id = Path(res.info["est_name"]).name
+
+    trajs = res.trajectories
+    empty = np.empty((0, 3))
+    gt_xyz = trajs[ref_id].positions_xyz if ref_id in trajs else empty
+    est_xyz = trajs[est_id].positions_xyz if est_id in trajs else empty
+
+    if not USE_CACHE:
+        return gt_xyz, est_xyz
+
+    tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            np.savez(f, gt=gt_xyz, est=est_xyz)
+        os.replace(tmp, cache)
+    except OSError as e:
+        print(f"Could not write cache {cache}: {e}")
+        tmp.unlink(missing_ok=True)
+
+    return gt_xyz, est_xyz
 
-    zips = glob.glob(os.path.join(evo_agent_dir, "**", "*.zip"), recursive=True)
+
+def load_trajectories(evo_agent_dir):
+    zips = [
+        Path(root) / name
+        for root, _, names in os.walk(evo_agent_dir, followlinks=True)
+        for name in names
+        if name.endswith(".zip") and "ape_trans" in name
+    ]
 
     print(f"Found {len(zips)} trajectory files.")
 
-    for z in zips:
-        if "ape_trans" not in z:
-            continue
+    est_positions = {}
+    gt_positions = None
 
-        parent = Path(z).parent.name
+    for z in zips:
+        parent = z.parent.name
 
-        algo_label = None
-        for key, mapped_name in NAME_MAPPING.items():
-            if key in parent:
-                algo_label = mapped_name
-                break
+        match = NAME_PATTERN.search(parent)
+        algo_label = NAME_MAPPING[match.group()] if match else None
 
         if algo_label not in ALGORITHMS:
             continue
 
         try:
-            res = file_interface.load_res_file(z, load_trajectories=True)
-
-            ref_id = Path(res.info["ref_name"]).name
-            est_id = Path(res.info["est_name"]).name
+            gt_xyz, est_xyz = _load_positions(z)
 
-            if gt_traj is None:
-                if ref_id in res.trajectories:
-                    gt_traj = res.trajectories[ref_id]
+            if gt_positions is None and len(gt_xyz):
+                gt_positions = gt_xyz
 
-            if est_id in res.trajectories:
-                est_trajs[algo_label] = res.trajectories[est_id]
+            if len(est_xyz):
+                est_positions[algo_label] = est_xyz
 
         except Exception as e:
             print(f"Error loading {z}: {e}")
 
-    return est_trajs, gt_traj
+        if gt_positions is not None and len(est_positions) >= len(ALGORITHMS):
+            break
+
+    return est_positions, gt_positions
 
 
 def plot_auv(evo_agent_dir, output_dir, auv_name):
-    est_trajs, gt_traj = load_trajectories(evo_agent_dir)
+    est_positions, gt_positions = load_trajectories(evo_agent_dir)
 
-    present_algos = list(est_trajs.keys())
+    present_algos = list(est_positions.keys())
     missing_algos = [algo for algo in ALGORITHMS if algo not in present_algos]
 
     if missing_algos:
         print(f"The following algorithms are missing from {auv_name}: {missing_algos}")
 
-    if gt_traj is None:
+    if gt_positions is None:
         print(f"No truth trajectory found for {auv_name}, skipping.")
         return
 
-    fig = plt.figure(figsize=SETTINGS.plot_figsize)
-    ax = plot.prepare_axis(fig, plot.PlotMode.xy)
+    fig, ax = plt.subplots(figsize=SETTINGS.plot_figsize)
     ax.set_xlabel("$x$ (m)")
     ax.set_ylabel("$y$ (m)")
+    ax.set_aspect("equal")
+
+    plotted = [algo for algo in ALGORITHMS if algo in est_positions]
+    for algo in plotted:
+        _plot_xy(ax, est_positions[algo], "-", COLORS[algo], algo)
+    _plot_xy(ax, gt_positions, "--", COLORS["GT"], "GT")
 
-    for algo in ALGORITHMS:
-        if algo in est_trajs:
-            plot.traj(
-                ax,
-                plot.PlotMode.xy,
-                est_trajs[algo],
-                style="-",
-                color=COLORS[algo],
-                label=algo,
-            )
-            add_start_end_markers(
-                ax,
-                est_trajs[algo],
-                start_color=COLORS[algo],
-                end_color=COLORS[algo],
-            )
-
-    plot.traj(
-        ax,
-        plot.PlotMode.xy,
-        gt_traj,
-        style="--",
-        color=COLORS["GT"],
-        label="GT",
-    )
-    add_start_end_markers(
-        ax,
-        gt_traj,
-        start_color=COLORS["GT"],
-        end_color=COLORS["GT"],
-    )
+    paths = [est_positions[algo] for algo in plotted] + [gt_positions]
+    colors = [COLORS[algo] for algo in plotted] + [COLORS["GT"]]
+    # (path, start/end, xy)
+    ends = np.stack([xyz[[0, -1], :2] for xyz in paths])
+    ax.scatter(ends[:, 0, 0], ends[:, 0, 1], c=colors, marker="o", zorder=10)
+    ax.scatter(ends[:, 1, 0], ends[:, 1, 1], c=colors, marker="x", zorder=10)
 
     ax.set_title("")
     plt.legend(frameon=True)
 
     output_path = os.path.join(output_dir, f"{auv_name}_trajectories.png")
-    plt.savefig(output_path, dpi=300, bbox_inches="tight")
+    plt.savefig(output_path, dpi=150, pil_kwargs={"compress_level": 1})
     print(f"Saved {output_path}")
     plt.close(fig)
 
 
+def _plot_auv_star(args):
+    return plot_auv(*args)
+
+
 def main():
     bags_root = Path(__file__).parent.parent.parent / "bags"
     if not bags_root.exists():
@@ -198,6 +202,7 @@ def main():
 
     print("Loading trajectory data and generating plots...")
 
+    tasks = []
     for bag_dir in bags_root.iterdir():
         if not bag_dir.is_dir():
             continue
@@ -208,7 +213,10 @@ def main():
 
         for agent_dir in evo_dir.iterdir():
             if agent_dir.is_dir():
-                plot_auv(str(agent_dir), str(bag_dir), agent_dir.name)
+                tasks.append((str(agent_dir), str(bag_dir), agent_dir.name))
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(_plot_auv_star, tasks))
 
     print("Done.")
 